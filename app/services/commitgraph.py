@@ -1,3 +1,4 @@
+import os
 import requests
 from datetime import datetime, timedelta, date
 from collections import defaultdict
@@ -16,6 +17,9 @@ from io import IOBase
 
 db = firestore.Client()
 
+# Overridable so the service can be pointed at a stub GitHub (see loadtest/)
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
 THEMES = {
     "dark": {
         "style": "dark_background",
@@ -134,7 +138,7 @@ def check_valid_user_and_repo(owner: str, repo: str) -> Dict[str, Any]:
         )
 
         github_api_username_repo_response = requests.get(
-            f"https://api.github.com/repos/{owner}/{repo}"
+            f"{GITHUB_API_URL}/repos/{owner}/{repo}"
         )
 
         # If both requests are successful, we assume the user and repo are valid
@@ -340,7 +344,7 @@ def fetch_commit_count_per_day(owner: str, repo: str, period: str) -> OrderedDic
         OrderedDict: An ordered dictionary with dates as keys and commit counts as values.
     """
     validate_repository(owner, repo)
-    base_url = f"https://api.github.com/repos/{owner}/{repo}/commits"
+    base_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/commits"
     start_date, end_date = get_date_range(period)
     days = (end_date - start_date).days
     commit_count = initialize_commit_count(start_date, days)
@@ -4,7 +4,7 @@ from app.services.commitgraph import (
     plot_commit_count,
     RepoNotFoundError,
     NoCommitsFoundError,
-    InvalidUsername,
+    InvalidUsernameAndRepositoryCombination,
     THEMES,
     PERIODS,
 )
@@ -66,7 +66,7 @@ def get_commit_graph():
             return jsonify({"message": str(e), "status_code": 400}), 400
         except ValueError or TypeError as e:
             return jsonify({"message": str(e), "status_code": 400}), 400
-        except InvalidUsername as e:
+        except InvalidUsernameAndRepositoryCombination as e:
             return jsonify({"message": str(e), "status_code": 400}), 400
     else:
         return (
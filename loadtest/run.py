@@ -0,0 +1,466 @@
+"""
+Load test the /v1/commit-graph endpoint under gunicorn against a stub GitHub.
+
+Boots main:app with the given gunicorn worker model, replays a request mix with
+Zipf-distributed repository popularity across every theme and period, and reports
+throughput, latency percentiles, RSS growth per worker and GitHub rate limit usage.
+
+Firestore is not stubbed: start the emulator and export FIRESTORE_EMULATOR_HOST
+(and GOOGLE_CLOUD_PROJECT) before running. The harness refuses to run against the
+real Firestore cache unless --allow-real-firestore is given, since every stub repo
+it requests is written to the cache collection.
+
+Headline latency percentiles only cover 2xx responses. Errors return early and
+would make the service look faster than it is, so the report also breaks latency
+down per period and status; check it before sizing instances from a run.
+
+Usage:
+    python -m loadtest.run --workers 2 --threads 4 --requests 500 --concurrency 8
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from loadtest.stub_github import DEFAULT_RATE_LIMIT, StubGitHub, repo_names
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Kept in sync with THEMES/PERIODS in app/services/commitgraph.py, which cannot be
+# imported here without initialising a Firestore client
+THEMES = ["dark", "light", "sunset", "forest", "ocean", "sakura", "monochrome", "rainbow"]
+PERIODS = ["month", "year", "all"]
+
+READINESS_PATH = "/v1/commit-graph"
+
+
+def zipf_weights(count: int, exponent: float) -> List[float]:
+    """
+    Compute normalised Zipf weights, so that rank k is requested proportionally to 1/k^s.
+
+    Args:
+        count (int): The number of ranked items.
+        exponent (float): The Zipf exponent s; 0 gives a uniform distribution.
+
+    Returns:
+        List[float]: The weight of each rank, summing to 1.
+    """
+    weights = [1 / (rank**exponent) for rank in range(1, count + 1)]
+    total = sum(weights)
+    return [weight / total for weight in weights]
+
+
+def build_request_mix(
+    repos: Sequence[Tuple[str, str]], count: int, exponent: float, seed: int
+) -> List[str]:
+    """
+    Build a reproducible list of request paths for the commit graph endpoint.
+
+    Args:
+        repos (Sequence[Tuple[str, str]]): The (owner, repo) pairs, most popular first.
+        count (int): The number of requests to generate.
+        exponent (float): The Zipf exponent for repository popularity.
+        seed (int): The random seed.
+
+    Returns:
+        List[str]: Request paths including the query string.
+    """
+    rng = random.Random(seed)
+    chosen = rng.choices(repos, weights=zipf_weights(len(repos), exponent), k=count)
+    paths = []
+    for owner, repo in chosen:
+        query = {
+            "username": owner,
+            "repo": repo,
+            "period": rng.choice(PERIODS),
+            "theme": rng.choice(THEMES),
+        }
+        paths.append(f"/v1/commit-graph?{urlencode(query)}")
+    return paths
+
+
+def request_period(path: str) -> str:
+    """
+    Extract the period query parameter from a commit graph request path.
+
+    Args:
+        path (str): The request path including the query string.
+
+    Returns:
+        str: The requested period.
+    """
+    return parse_qs(urlparse(path).query)["period"][0]
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted sequence.
+
+    Args:
+        sorted_values (Sequence[float]): The values, sorted ascending.
+        percent (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty sequence.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-percent * len(sorted_values) // 100)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarise latencies in milliseconds.
+
+    Args:
+        latencies (List[float]): The latencies in milliseconds, in any order.
+
+    Returns:
+        Dict[str, float]: The request count, p50, p95, p99 and max latency.
+    """
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "p50": round(percentile(latencies, 50), 1),
+        "p95": round(percentile(latencies, 95), 1),
+        "p99": round(percentile(latencies, 99), 1),
+        "max": round(latencies[-1], 1) if latencies else 0.0,
+    }
+
+
+def child_pids(parent_pid: int) -> List[int]:
+    """
+    List the direct children of a process by scanning /proc (Linux only).
+
+    Args:
+        parent_pid (int): The parent process id, i.e. the gunicorn master.
+
+    Returns:
+        List[int]: The child process ids, i.e. the gunicorn workers.
+    """
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The command name may contain spaces, so split after its closing paren
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def rss_kb(pid: int) -> Optional[int]:
+    """
+    Read the resident set size of a process from /proc (Linux only).
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        Optional[int]: The RSS in kB, or None if the process has gone away.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(
+    port: int, args: argparse.Namespace, github_url: str
+) -> subprocess.Popen:
+    """
+    Boot main:app under gunicorn with the requested worker model.
+
+    Args:
+        port (int): The local port to bind to.
+        args (argparse.Namespace): The parsed command line arguments.
+        github_url (str): The stub GitHub base URL handed to the service.
+
+    Returns:
+        subprocess.Popen: The gunicorn master process.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "-b",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(args.workers),
+        "--threads",
+        str(args.threads),
+        "--worker-class",
+        args.worker_class,
+        "--timeout",
+        str(args.timeout),
+        "main:app",
+    ]
+    env = dict(os.environ, GITHUB_API_URL=github_url)
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def wait_until_ready(
+    process: subprocess.Popen, port: int, workers: int, timeout: float
+) -> None:
+    """
+    Block until gunicorn has forked all of its workers and one of them has loaded
+    main:app and answered an HTTP request. Accepting connections is not enough, as
+    workers that fail to import the app are forked and die in a loop.
+
+    Raises:
+        RuntimeError: If gunicorn exits or is not ready before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        if len(child_pids(process.pid)) >= workers:
+            # Missing parameters are rejected by request validation, so this
+            # reaches neither GitHub nor Firestore
+            _, status = send_request(port, READINESS_PATH, timeout=1)
+            if status:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"gunicorn was not ready after {timeout} seconds")
+
+
+def send_request(port: int, path: str, timeout: float) -> Tuple[float, int]:
+    """
+    Issue one GET request on a fresh connection and read the full response.
+
+    Returns:
+        Tuple[float, int]: The latency in seconds and the HTTP status, 0 on a
+        connection error.
+    """
+    started = time.perf_counter()
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+    except (OSError, http.client.HTTPException):
+        status = 0
+    finally:
+        connection.close()
+    return time.perf_counter() - started, status
+
+
+def run_load(
+    port: int, paths: Sequence[str], concurrency: int, timeout: float
+) -> Tuple[List[Tuple[float, int]], float]:
+    """
+    Replay the request paths with a fixed number of concurrent closed-loop clients.
+
+    Returns:
+        Tuple[List[Tuple[float, int]], float]: The (latency, status) of every
+        request and the wall clock duration of the run in seconds.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda path: send_request(port, path, timeout), paths))
+    return results, time.perf_counter() - started
+
+
+def summarise(
+    results: List[Tuple[float, int]],
+    periods: List[str],
+    elapsed: float,
+    rss_before: Dict[int, Optional[int]],
+    rss_after: Dict[int, Optional[int]],
+    github_calls: int,
+    rate_limit: int,
+) -> Dict[str, Any]:
+    """
+    Turn raw measurements into the report.
+
+    Args:
+        results (List[Tuple[float, int]]): The (latency, status) of every request.
+        periods (List[str]): The requested period of every request, aligned with results.
+
+    Returns:
+        Dict[str, Any]: Throughput, latency percentiles in milliseconds for 2xx
+        responses and per period and status, status counts, per worker RSS in kB
+        and GitHub rate limit usage.
+    """
+    successful = []
+    statuses: Dict[str, int] = {}
+    by_period: Dict[str, Dict[str, List[float]]] = {}
+    for (latency, status), period in zip(results, periods):
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        by_period.setdefault(period, {}).setdefault(str(status), []).append(
+            latency * 1000
+        )
+        if 200 <= status < 300:
+            successful.append(latency * 1000)
+    workers = {}
+    for pid, before in rss_before.items():
+        after = rss_after.get(pid)
+        workers[str(pid)] = {
+            "rss_start_kb": before,
+            "rss_end_kb": after,
+            "rss_growth_kb": (
+                after - before if before is not None and after is not None else None
+            ),
+        }
+    calls_per_hour = github_calls / elapsed * 3600 if elapsed else 0.0
+    return {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "successful_rps": round(len(successful) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(successful),
+        "latency_ms_by_period": {
+            period: {
+                status: latency_summary(latencies)
+                for status, latencies in sorted(by_status.items())
+            }
+            for period, by_status in sorted(by_period.items())
+        },
+        "statuses": statuses,
+        "workers": workers,
+        "github": {
+            "calls": github_calls,
+            "calls_per_request": round(github_calls / len(results), 2) if results else 0.0,
+            "calls_per_hour": round(calls_per_hour),
+            "rate_limit_per_hour": rate_limit,
+            "budget_used_pct": round(calls_per_hour / rate_limit * 100, 1),
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency = report["latency_ms"]
+    github = report["github"]
+    print(f"requests     {report['requests']} in {report['elapsed_s']}s")
+    print(
+        f"throughput   {report['throughput_rps']} req/s "
+        f"({report['successful_rps']} req/s 2xx)"
+    )
+    print(
+        f"latency ms   p50={latency['p50']} p95={latency['p95']} "
+        f"p99={latency['p99']} max={latency['max']} (2xx only)"
+    )
+    print(f"statuses     {report['statuses']}")
+    for period, by_status in report["latency_ms_by_period"].items():
+        for status, summary in by_status.items():
+            print(
+                f"  {period:<6} {status}  n={summary['count']} p50={summary['p50']} "
+                f"p95={summary['p95']} p99={summary['p99']}"
+            )
+    if any(not status.startswith("2") for status in report["statuses"]):
+        print("warning: the run contains errors, see the per period breakdown")
+    for pid, worker in report["workers"].items():
+        print(
+            f"worker {pid}  rss {worker['rss_start_kb']} -> {worker['rss_end_kb']} kB "
+            f"(growth {worker['rss_growth_kb']} kB)"
+        )
+    print(
+        f"github       {github['calls']} calls, {github['calls_per_request']} per request, "
+        f"{github['calls_per_hour']}/h = {github['budget_used_pct']}% "
+        f"of {github['rate_limit_per_hour']}/h"
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--timeout", type=int, default=30, help="gunicorn worker timeout")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20, help="requests before RSS baseline")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repos", type=int, default=100)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--max-commits-per-day", type=int, default=5)
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument(
+        "--allow-real-firestore",
+        action="store_true",
+        help="run without the Firestore emulator, writing stub repos to the real cache",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if "FIRESTORE_EMULATOR_HOST" not in os.environ and not args.allow_real_firestore:
+        sys.exit(
+            "error: FIRESTORE_EMULATOR_HOST is not set; start the Firestore emulator "
+            "or pass --allow-real-firestore to write to the real cache"
+        )
+
+    repos = repo_names(args.repos)
+    paths = build_request_mix(repos, args.warmup + args.requests, args.zipf, args.seed)
+    stub = StubGitHub(
+        repo_count=args.repos,
+        history_days=args.history_days,
+        max_commits_per_day=args.max_commits_per_day,
+        rate_limit=args.rate_limit,
+    ).start()
+    port = free_port()
+    gunicorn = start_gunicorn(port, args, stub.url)
+    try:
+        wait_until_ready(gunicorn, port, args.workers, timeout=60)
+        run_load(port, paths[: args.warmup], args.concurrency, args.timeout)
+
+        pids = child_pids(gunicorn.pid)
+        rss_before = {pid: rss_kb(pid) for pid in pids}
+        calls_before = stub.total_calls
+        results, elapsed = run_load(
+            port, paths[args.warmup :], args.concurrency, args.timeout
+        )
+        rss_after = {pid: rss_kb(pid) for pid in pids}
+        github_calls = stub.total_calls - calls_before
+    finally:
+        try:
+            gunicorn.send_signal(signal.SIGTERM)
+            try:
+                gunicorn.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                gunicorn.kill()
+                gunicorn.wait()
+        finally:
+            stub.stop()
+
+    periods = [request_period(path) for path in paths[args.warmup :]]
+    report = summarise(
+        results, periods, elapsed, rss_before, rss_after, github_calls, args.rate_limit
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+REPO_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)(?P<commits>/commits)?$")
+
+# Unauthenticated GitHub API limit, which is what the service currently runs under
+DEFAULT_RATE_LIMIT = 60
+
+
+def repo_names(count: int) -> List[Tuple[str, str]]:
+    """
+    Build the list of (owner, repo) pairs served by the stub.
+
+    Args:
+        count (int): The number of repositories to generate.
+
+    Returns:
+        List[Tuple[str, str]]: The generated owner/repo pairs, most popular first.
+    """
+    return [(f"owner{i}", f"repo{i}") for i in range(count)]
+
+
+def generate_commit_dates(
+    owner: str, repo: str, history_days: int, max_commits_per_day: int
+) -> List[datetime]:
+    """
+    Deterministically generate the commit timestamps of a stub repository.
+
+    Args:
+        owner (str): The owner of the repository.
+        repo (str): The repository name.
+        history_days (int): How many days back the history goes.
+        max_commits_per_day (int): The upper bound of commits on any single day.
+
+    Returns:
+        List[datetime]: Commit timestamps, newest first like the GitHub API.
+    """
+    rng = random.Random(f"{owner}/{repo}")
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    dates = []
+    for day in range(history_days):
+        for _ in range(rng.randint(0, max_commits_per_day)):
+            dates.append(now - timedelta(days=day, seconds=rng.randint(0, 86399)))
+    dates.sort(reverse=True)
+    return dates
+
+
+class StubGitHub:
+    """
+    A minimal in-process stand-in for the parts of the GitHub REST API used by the
+    commit graph service, counting every call made against its rate limit budget.
+    """
+
+    def __init__(
+        self,
+        repo_count: int = 100,
+        history_days: int = 730,
+        max_commits_per_day: int = 5,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.rate_limit = rate_limit
+        self.repos: Dict[Tuple[str, str], List[datetime]] = {
+            name: generate_commit_dates(*name, history_days, max_commits_per_day)
+            for name in repo_names(repo_count)
+        }
+        self.calls: Dict[str, int] = {"repo": 0, "commits": 0, "not_found": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(self.calls.values())
+
+    def start(self) -> "StubGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def record_call(self, kind: str) -> int:
+        """
+        Count a call against the budget.
+
+        Args:
+            kind (str): The kind of call ('repo', 'commits' or 'not_found').
+
+        Returns:
+            int: The remaining rate limit budget after this call, floored at zero.
+        """
+        with self._lock:
+            self.calls[kind] += 1
+            return max(self.rate_limit - sum(self.calls.values()), 0)
+
+    def commits_page(
+        self, owner: str, repo: str, query: Dict[str, List[str]]
+    ) -> Tuple[List[dict], bool]:
+        """
+        Build one page of the commits listing, honouring 'since', 'page' and 'per_page'.
+
+        Returns:
+            Tuple[List[dict], bool]: The page of commits and whether a next page exists.
+        """
+        dates = self.repos[(owner, repo)]
+        since = query.get("since", [None])[0]
+        if since:
+            since_date = datetime.fromisoformat(since.replace("Z", "+00:00"))
+            if since_date.tzinfo is None:
+                since_date = since_date.replace(tzinfo=timezone.utc)
+            dates = [d for d in dates if d >= since_date]
+        page = int(query.get("page", ["1"])[0])
+        per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+        start = (page - 1) * per_page
+        page_dates = dates[start : start + per_page]
+        commits = [
+            {"commit": {"committer": {"date": d.strftime("%Y-%m-%dT%H:%M:%SZ")}}}
+            for d in page_dates
+        ]
+        return commits, start + per_page < len(dates)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                match = REPO_PATH.match(parsed.path)
+                name = (match["owner"], match["repo"]) if match else None
+                if name not in stub.repos:
+                    remaining = stub.record_call("not_found")
+                    self._send(404, {"message": "Not Found"}, remaining)
+                    return
+                if not match["commits"]:
+                    remaining = stub.record_call("repo")
+                    self._send(200, {"full_name": "/".join(name)}, remaining)
+                    return
+                remaining = stub.record_call("commits")
+                query = parse_qs(parsed.query)
+                commits, has_next = stub.commits_page(*name, query)
+                link = None
+                if has_next:
+                    page = int(query.get("page", ["1"])[0])
+                    next_query = urlencode(dict(query, page=[page + 1]), doseq=True)
+                    link = f'<{stub.url}{parsed.path}?{next_query}>; rel="next"'
+                self._send(200, commits, remaining, link)
+
+            def _send(self, status, payload, remaining, link=None):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("X-RateLimit-Limit", str(stub.rate_limit))
+                self.send_header("X-RateLimit-Remaining", str(remaining))
+                self.send_header("X-RateLimit-Reset", str(int(time.time()) + 3600))
+                if link:
+                    self.send_header("Link", link)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,106 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+from loadtest.run import (
+    build_request_mix,
+    percentile,
+    request_period,
+    summarise,
+    zipf_weights,
+)
+from loadtest.stub_github import StubGitHub, repo_names
+
+
+class TestLoadTestHelpers(unittest.TestCase):
+    def test_zipf_weights(self):
+        weights = zipf_weights(10, 1.0)
+        self.assertAlmostEqual(sum(weights), 1.0)
+        self.assertAlmostEqual(weights[0] / weights[1], 2.0)
+        self.assertEqual(zipf_weights(4, 0.0), [0.25] * 4)
+
+    def test_request_mix_is_reproducible(self):
+        repos = repo_names(20)
+        paths = build_request_mix(repos, 200, 1.1, seed=1)
+        self.assertEqual(paths, build_request_mix(repos, 200, 1.1, seed=1))
+        self.assertTrue(all(p.startswith("/v1/commit-graph?username=") for p in paths))
+        self.assertEqual({request_period(p) for p in paths}, {"month", "year", "all"})
+        most_popular = sum("repo=repo0&" in p for p in paths)
+        least_popular = sum("repo=repo19&" in p for p in paths)
+        self.assertGreater(most_popular, least_popular)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_summarise(self):
+        results = [(0.1, 200), (0.2, 200), (0.005, 500)]
+        periods = ["month", "year", "all"]
+        report = summarise(results, periods, 1.5, {1: 1000}, {1: 1500}, 30, 60)
+        self.assertEqual(report["throughput_rps"], 2.0)
+        self.assertAlmostEqual(report["successful_rps"], 1.33)
+        self.assertEqual(report["statuses"], {"200": 2, "500": 1})
+        self.assertEqual(report["latency_ms"]["count"], 2)
+        self.assertEqual(report["latency_ms"]["p50"], 100.0)
+        self.assertEqual(report["latency_ms_by_period"]["all"]["500"]["p99"], 5.0)
+        self.assertEqual(report["workers"]["1"]["rss_growth_kb"], 500)
+        self.assertEqual(report["github"]["calls_per_request"], 10.0)
+        self.assertEqual(report["github"]["calls_per_hour"], 72000)
+
+
+class TestStubGitHub(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubGitHub(repo_count=2, history_days=60, rate_limit=100).start()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def get(self, path):
+        with urlopen(self.stub.url + path) as response:
+            return json.loads(response.read()), response.headers
+
+    def test_repo_lookup_and_rate_limit_headers(self):
+        body, headers = self.get("/repos/owner0/repo0")
+        self.assertEqual(body["full_name"], "owner0/repo0")
+        self.assertEqual(headers["X-RateLimit-Remaining"], "99")
+        with self.assertRaises(HTTPError) as error:
+            self.get("/repos/nobody/nothing")
+        self.assertEqual(error.exception.code, 404)
+        self.assertEqual(self.stub.calls, {"repo": 1, "commits": 0, "not_found": 1})
+
+    def test_commits_are_paginated_and_filtered(self):
+        since = (datetime.now(timezone.utc) - timedelta(days=30)).date().isoformat()
+        expected = [
+            d for d in self.stub.repos[("owner0", "repo0")]
+            if d.date().isoformat() >= since
+        ]
+        commits, page = [], 1
+        while True:
+            body, headers = self.get(
+                f"/repos/owner0/repo0/commits?page={page}&per_page=10&since={since}"
+            )
+            commits.extend(body)
+            if headers["Link"] is None:
+                break
+            page += 1
+            next_url = headers["Link"].split(">")[0].lstrip("<")
+            self.assertEqual(
+                parse_qs(urlparse(next_url).query),
+                {"page": [str(page)], "per_page": ["10"], "since": [since]},
+            )
+        self.assertEqual(len(commits), len(expected))
+        self.assertEqual(self.stub.total_calls, page)
+
+
+if __name__ == "__main__":
+    unittest.main()